@@ -5,17 +5,21 @@ A secure chatbot that can manage markdown files within a dedicated folder using
 """
 
 import os
+import re
+import sys
 import json
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from openai import OpenAI
 from dotenv import load_dotenv
 
 from file_operations import (
-    AVAILABLE_FUNCTIONS, 
-    FUNCTION_SCHEMAS, 
+    AVAILABLE_FUNCTIONS,
+    FUNCTION_SCHEMAS,
     get_function_info,
+    validate_paths,
     DOCUMENTS_ROOT
 )
+from demo_common import build_model_blocks, render_models_block
 
 # Load environment variables
 load_dotenv()
@@ -56,6 +60,73 @@ AVAILABLE_MODELS = {
     }
 }
 
+# Display blocks for the model listing, built once from the static table
+_MODEL_BLOCKS = build_model_blocks(AVAILABLE_MODELS)
+
+# System prompt built once at import. OpenAI's automatic prompt caching keys on
+# a byte-identical message prefix, so the static system message must be built
+# deterministically (no timestamps or per-instance content) and reused verbatim
+# on every request.
+_FUNCTION_LIST = "\n".join(f"- {name}" for name in AVAILABLE_FUNCTIONS)
+
+SYSTEM_PROMPT = f"""You are a helpful markdown file management assistant. You can help users manage their markdown files within a secure documents folder.
+
+AVAILABLE FUNCTIONS:
+{_FUNCTION_LIST}
+
+SECURITY CONSTRAINTS:
+- You can ONLY work with files in the documents/ folder
+- You cannot access files outside this folder
+- All file operations are restricted to this sandbox
+
+CAPABILITIES:
+- List files and folders in the documents directory
+- Read, create, update, and delete markdown files
+- Create directories and organize files
+- Rename and move files within the documents folder
+
+BEHAVIOR GUIDELINES:
+- Always be helpful and clear in your responses
+- Use functions when the user requests file operations
+- Explain what you're doing before calling functions
+- Provide clear feedback about the results
+- If a function fails, explain why and suggest alternatives
+- For destructive operations (delete), confirm the action was successful
+
+RESPONSE STYLE:
+- Be conversational and friendly
+- Use emojis to make responses more engaging
+- Provide helpful suggestions for next actions
+- When showing file contents, format them nicely
+
+Remember: You are a file management assistant focused on helping users organize and manage their markdown documents safely and efficiently."""
+
+# Path-like tokens that plainly point outside the sandbox: parent-directory
+# traversal, absolute system paths, and Windows drive letters. Used to answer
+# obvious escape attempts locally instead of spending an LLM round trip on a
+# deterministic refusal. The system-path branch only matches at the start of
+# a token (lookbehind rejects a preceding path or word character), so an
+# in-sandbox relative path like "projects/home/notes.md" is never mistaken
+# for an absolute /home/ reference.
+_SUSPECT_PATH_RE = re.compile(
+    r"(?:\.\.[/\\]|(?<![\w./\\-])/(?:etc|tmp|usr|var|home|root|bin|dev|proc|sys)/|[A-Za-z]:[\\/])[^\s'\"]*"
+)
+
+# Conversational requests to operate on the parent directory itself ("list
+# the parent directory") carry no path token for _SUSPECT_PATH_RE to catch.
+# Only a listing/read verb aimed directly at the parent directory counts;
+# "the parent directory of X" describes an in-sandbox destination and is
+# left for the model, as is any message naming a concrete file or folder.
+_PARENT_DIR_REQUEST_RE = re.compile(
+    r"\b(?:list|show|read|open|browse|view|display|access)\b[^.?!]*"
+    r"\bthe parent (?:directory|folder)\b(?!\s+of\b)",
+    re.IGNORECASE,
+)
+
+# A concrete in-sandbox reference (a .md filename or a relative sub-path)
+# means the request is about sandbox contents, not about escaping it
+_SANDBOX_TOKEN_RE = re.compile(r"[\w-]+\.md\b|\b[\w-]+[/\\][\w-]+")
+
 class MarkdownChatbot:
     """
     A chatbot that can manage markdown files using OpenAI function calling.
@@ -144,39 +215,7 @@ class MarkdownChatbot:
 
     def _get_system_prompt(self) -> str:
         """Get the system prompt that defines the chatbot's behavior."""
-        function_list = "\n".join([f"- {name}" for name in AVAILABLE_FUNCTIONS.keys()])
-        
-        return f"""You are a helpful markdown file management assistant. You can help users manage their markdown files within a secure documents folder.
-
-AVAILABLE FUNCTIONS:
-{function_list}
-
-SECURITY CONSTRAINTS:
-- You can ONLY work with files in the documents/ folder
-- You cannot access files outside this folder
-- All file operations are restricted to this sandbox
-
-CAPABILITIES:
-- List files and folders in the documents directory
-- Read, create, update, and delete markdown files
-- Create directories and organize files
-- Rename and move files within the documents folder
-
-BEHAVIOR GUIDELINES:
-- Always be helpful and clear in your responses
-- Use functions when the user requests file operations
-- Explain what you're doing before calling functions
-- Provide clear feedback about the results
-- If a function fails, explain why and suggest alternatives
-- For destructive operations (delete), confirm the action was successful
-
-RESPONSE STYLE:
-- Be conversational and friendly
-- Use emojis to make responses more engaging
-- Provide helpful suggestions for next actions
-- When showing file contents, format them nicely
-
-Remember: You are a file management assistant focused on helping users organize and manage their markdown documents safely and efficiently."""
+        return SYSTEM_PROMPT
 
     def execute_function_call(self, function_name: str, arguments: Dict) -> Dict:
         """
@@ -191,7 +230,11 @@ Remember: You are a file management assistant focused on helping users organize
         """
         print(f"🔧 Executing: {function_name}({arguments})")
         
-        if function_name not in AVAILABLE_FUNCTIONS:
+        # Interning the incoming name lets the registry lookup hit the
+        # interned keys by pointer identity; get() folds the membership test
+        # and the fetch into one probe
+        function_to_call = AVAILABLE_FUNCTIONS.get(sys.intern(function_name))
+        if function_to_call is None:
             error_result = {
                 "error": f"Function '{function_name}' not available",
                 "available_functions": list(AVAILABLE_FUNCTIONS.keys()),
@@ -201,7 +244,6 @@ Remember: You are a file management assistant focused on helping users organize
             return error_result
         
         try:
-            function_to_call = AVAILABLE_FUNCTIONS[function_name]
             result = function_to_call(**arguments)
             
             # Display the detailed function output for debugging
@@ -314,13 +356,43 @@ Remember: You are a file management assistant focused on helping users organize
             if 'message' in result:
                 print(f"  💬 Message: {result['message']}")
 
+    def _security_denial(self, user_message: str) -> Optional[str]:
+        """
+        Cheap pre-classifier for prompts that plainly request files outside
+        the documents sandbox.
+
+        Extracts path-like tokens from the message and runs them through
+        validate_path; if any fails (or the prompt asks to list or read the
+        parent directory itself), returns a canned denial so no LLM call is
+        spent on a deterministic refusal. Returns None for everything else,
+        including in-sandbox requests that merely mention a parent directory.
+
+        Args:
+            user_message: The user's input message
+
+        Returns:
+            A denial message, or None if the request looks legitimate
+        """
+        candidates = [c.rstrip(".,;:!?") for c in _SUSPECT_PATH_RE.findall(user_message)]
+        for candidate, outcome in validate_paths(candidates).items():
+            if not outcome["safe"]:
+                return (f"🔒 I can't access '{candidate}' — it's outside the secure "
+                        "documents sandbox. I can only work with files inside the "
+                        "documents/ folder.")
+        if (_PARENT_DIR_REQUEST_RE.search(user_message)
+                and not _SANDBOX_TOKEN_RE.search(user_message)):
+            return ("🔒 I can't access the parent directory — it's outside the secure "
+                    "documents sandbox. I can only work with files inside the "
+                    "documents/ folder.")
+        return None
+
     def chat(self, user_message: str) -> str:
         """
         Process a user message and return the chatbot's response.
-        
+
         Args:
             user_message: The user's input message
-            
+
         Returns:
             The chatbot's response
         """
@@ -329,7 +401,16 @@ Remember: You are a file management assistant focused on helping users organize
             "role": "user",
             "content": user_message
         })
-        
+
+        # Answer obvious sandbox-escape requests locally (no tokens billed)
+        denial = self._security_denial(user_message)
+        if denial is not None:
+            self.conversation_history.append({
+                "role": "assistant",
+                "content": denial
+            })
+            return denial
+
         try:
             # Call OpenAI with function calling enabled
             response = self.client.chat.completions.create(
@@ -396,6 +477,120 @@ Remember: You are a file management assistant focused on helping users organize
             print(f"Error in chat: {e}")
             return error_message
 
+    def stream_chat(self, user_message: str) -> Iterator[str]:
+        """
+        Process a user message, streaming the response as it is generated.
+
+        Works like chat() but yields response tokens as they arrive from the
+        API, so callers can print output while the model is still generating
+        instead of waiting for the full response.
+
+        Args:
+            user_message: The user's input message
+
+        Yields:
+            Chunks of the chatbot's response text
+        """
+        # Add user message to conversation history
+        self.conversation_history.append({
+            "role": "user",
+            "content": user_message
+        })
+
+        # Answer obvious sandbox-escape requests locally (no tokens billed)
+        denial = self._security_denial(user_message)
+        if denial is not None:
+            self.conversation_history.append({
+                "role": "assistant",
+                "content": denial
+            })
+            yield denial
+            return
+
+        try:
+            # Call OpenAI with function calling and streaming enabled
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=self.conversation_history,
+                functions=FUNCTION_SCHEMAS,
+                function_call="auto",
+                temperature=0.7,
+                stream=True
+            )
+
+            # Accumulate the streamed response; a function call arrives in
+            # pieces (name first, then argument fragments)
+            content_parts = []
+            function_name = None
+            function_args_parts = []
+
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.function_call:
+                    if delta.function_call.name:
+                        function_name = delta.function_call.name
+                    if delta.function_call.arguments:
+                        function_args_parts.append(delta.function_call.arguments)
+                elif delta.content:
+                    content_parts.append(delta.content)
+                    yield delta.content
+
+            # Check if the model wants to call a function
+            if function_name:
+                arguments_json = "".join(function_args_parts)
+                function_args = json.loads(arguments_json or "{}")
+
+                print(f"\n🎯 LLM wants to call: {function_name}")
+                print(f"📋 Arguments: {function_args}")
+
+                # Execute the function
+                function_result = self.execute_function_call(function_name, function_args)
+
+                # Add the function call and result to conversation history
+                self.conversation_history.append({
+                    "role": "assistant",
+                    "content": None,
+                    "function_call": {
+                        "name": function_name,
+                        "arguments": arguments_json
+                    }
+                })
+
+                self.conversation_history.append({
+                    "role": "function",
+                    "name": function_name,
+                    "content": json.dumps(function_result)
+                })
+
+                # Stream the final response from the model
+                final_response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self.conversation_history,
+                    temperature=0.7,
+                    stream=True
+                )
+
+                for chunk in final_response:
+                    if not chunk.choices:
+                        continue
+                    delta_content = chunk.choices[0].delta.content
+                    if delta_content:
+                        content_parts.append(delta_content)
+                        yield delta_content
+
+            # Add the assembled assistant response to conversation history
+            self.conversation_history.append({
+                "role": "assistant",
+                "content": "".join(content_parts)
+            })
+
+        except Exception as e:
+            error_message = f"❌ Sorry, I encountered an error: {str(e)}"
+            print(f"Error in chat: {e}")
+            yield error_message
+
     def get_conversation_summary(self) -> Dict:
         """Get a summary of the current conversation."""
         return {
@@ -453,15 +648,10 @@ def main():
                 chatbot.reset_conversation()
                 continue
             elif user_input.lower() == 'models':
-                print("\n🧠 AVAILABLE MODELS:")
-                for model_id, info in chatbot.get_available_models().items():
-                    current = "← CURRENT" if model_id == chatbot.model else ""
-                    recommended = "✅ RECOMMENDED" if info['recommended'] else ""
-                    print(f"  • {model_id}: {info['name']}")
-                    print(f"    💰 ${info['input_cost']:.2f}/${info['output_cost']:.2f} per million tokens")
-                    print(f"    📏 {info['context_window']} context")
-                    print(f"    📝 {info['description']} {recommended} {current}")
-                    print()
+                # Precomputed blocks, emitted with a single write
+                sys.stdout.write("\n🧠 AVAILABLE MODELS:\n"
+                                 + render_models_block(_MODEL_BLOCKS, chatbot.model))
+                sys.stdout.flush()
                 continue
             elif user_input.lower().startswith('switch to '):
                 model_name = user_input[10:].strip()
@@ -479,10 +669,8 @@ def main():
                 print()
                 continue
             elif user_input.lower() == 'help':
-                print("\n📚 HELP:")
-                print("Available commands:")
-                for func_name in AVAILABLE_FUNCTIONS.keys():
-                    print(f"  • {func_name}")
+                function_lines = "\n".join(f"  • {name}" for name in AVAILABLE_FUNCTIONS)
+                sys.stdout.write(f"\n📚 HELP:\nAvailable commands:\n{function_lines}\n")
                 print("\nModel commands:")
                 print("  • 'models' - Show all available AI models")
                 print("  • 'switch to MODEL_NAME' - Change AI model")
@@ -497,10 +685,11 @@ def main():
             elif not user_input:
                 continue
             
-            print(f"\n🤖 Assistant: ", end="")
-            response = chatbot.chat(user_input)
-            print(response)
-            print()
+            print(f"\n🤖 Assistant: ", end="", flush=True)
+            for token in chatbot.stream_chat(user_input):
+                sys.stdout.write(token)
+                sys.stdout.flush()
+            print("\n")
             
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
@@ -9,33 +9,82 @@ This script demonstrates the chatbot's capabilities including:
 """
 
 import os
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from chatbot import MarkdownChatbot
+from demo_common import (
+    _BAR60,
+    _BASIC_OPS_SCENARIOS,
+    _ADVANCED_OPS_SCENARIOS,
+    _SECURITY_SCENARIOS,
+    _NATURAL_LANGUAGE_SCENARIOS,
+    print_section,
+    build_model_blocks,
+    render_models_block,
+)
 
 # Load environment variables
 load_dotenv()
 
-def print_section(title: str):
-    """Print a formatted section header."""
-    print("\n" + "=" * 60)
-    print(f"🎯 {title}")
-    print("=" * 60)
-
 def demo_chat(chatbot: MarkdownChatbot, message: str, description: str = ""):
-    """Demonstrate a chat interaction."""
+    """Demonstrate a chat interaction, streaming the response as it arrives."""
     if description:
         print(f"\n💡 {description}")
     print(f"👤 User: {message}")
-    print("🤖 Assistant: ", end="")
-    response = chatbot.chat(message)
-    print(response)
+    print("🤖 Assistant: ", end="", flush=True)
+    for token in chatbot.stream_chat(message):
+        sys.stdout.write(token)
+        sys.stdout.flush()
+    print()
     time.sleep(1)  # Brief pause for readability
 
+def run_scenarios(chatbot: MarkdownChatbot, scenarios):
+    """
+    Run a precomputed table of (message, description) demo scenarios.
+
+    Keeps a one-deep lookahead: as soon as a response has been printed, the
+    next request is submitted to a background thread so the LLM call runs
+    during the 1 second readability pause instead of after it. Each
+    scenario's description and user lines are printed before its request is
+    submitted, so the function-call trace chat() prints from the worker
+    thread always lands after them and the transcript keeps the baseline
+    description -> user -> trace -> response order. Scripted scenarios use
+    the blocking chat() call rather than streaming so the lookahead request
+    can complete off-thread; the single worker preserves conversation order.
+    """
+    def show_prompt(message, description):
+        if description:
+            print(f"\n💡 {description}")
+        print(f"👤 User: {message}")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        show_prompt(*scenarios[0])
+        pending = executor.submit(chatbot.chat, scenarios[0][0])
+        for i in range(len(scenarios)):
+            response = pending.result()
+            print(f"🤖 Assistant: {response}")
+            if i + 1 < len(scenarios):
+                show_prompt(*scenarios[i + 1])
+                pending = executor.submit(chatbot.chat, scenarios[i + 1][0])
+            time.sleep(1)  # Brief pause for readability, overlapping the prefetch
+
+# Shared chatbot instance, created lazily and reused across demo runs so the
+# OpenAI client (and its HTTP connection pool) is only initialized once
+_chatbot = None
+
+def _ensure_chatbot() -> MarkdownChatbot:
+    """Return the shared MarkdownChatbot instance, creating it on first use."""
+    global _chatbot
+    if _chatbot is None:
+        _chatbot = MarkdownChatbot()
+    return _chatbot
+
 def main():
     """Run the interactive chatbot demo."""
     print("🚀 MARKDOWN FILE CHATBOT - INTERACTIVE DEMO")
-    print("=" * 60)
+    print(_BAR60)
     print("This demo showcases the chatbot's capabilities including:")
     print("• File management operations")
     print("• Natural language interface") 
@@ -54,7 +103,7 @@ def main():
         # Initialize chatbot with default cost-efficient model
         print_section("INITIALIZATION & MODEL SELECTION")
         print("Initializing chatbot with cost-efficient GPT-4o Mini...")
-        chatbot = MarkdownChatbot()
+        chatbot = _ensure_chatbot()
         
         # Show model information
         print("\n📊 Model Information:")
@@ -67,55 +116,36 @@ def main():
         # Demo 1: Model Comparison
         print_section("DEMO 1: MODEL COMPARISON & COST OPTIMIZATION")
         print("Let's explore the available models and their costs:")
-        
+
+        # Precompute the per-model display blocks and the cost comparison table
+        # once; later displays (including the interactive 'models' command)
+        # only overlay the "← CURRENT" marker instead of reformatting
+        models = chatbot.get_available_models()
+        model_blocks = build_model_blocks(models)
+        cost_table = "\n".join(
+            f"  • {info['name']}: ${(1.0 * info['input_cost']) + (0.2 * info['output_cost']):.2f}"
+            for info in models.values()
+        )
+
+        def print_models_block():
+            # One write for the whole listing instead of a print per model
+            sys.stdout.write(render_models_block(model_blocks, chatbot.model))
+            sys.stdout.flush()
+
         print("\n🧠 Available Models:")
-        for model_id, info in chatbot.get_available_models().items():
-            current = "← CURRENT" if model_id == chatbot.model else ""
-            recommended = "✅ RECOMMENDED" if info['recommended'] else ""
-            print(f"  • {model_id}: {info['name']}")
-            print(f"    💰 ${info['input_cost']:.2f}/${info['output_cost']:.2f} per million tokens")
-            print(f"    📏 {info['context_window']} context")
-            print(f"    📝 {info['description']} {recommended} {current}")
-            print()
-        
+        print_models_block()
+
         print("💡 Cost Comparison Example:")
         print("For 1 million input tokens + 200K output tokens:")
-        for model_id, info in chatbot.get_available_models().items():
-            total_cost = (1.0 * info['input_cost']) + (0.2 * info['output_cost'])
-            print(f"  • {info['name']}: ${total_cost:.2f}")
+        print(cost_table)
         
         # Demo 2: Basic File Operations
         print_section("DEMO 2: BASIC FILE OPERATIONS")
-        
-        demo_chat(chatbot, "List all my files", 
-                 "Starting with a simple directory listing")
-        
-        demo_chat(chatbot, "Create a file called demo-notes.md with some sample content about AI", 
-                 "Creating a new file with content")
-        
-        demo_chat(chatbot, "Read the demo-notes.md file", 
-                 "Reading the file we just created")
-        
-        demo_chat(chatbot, "Update demo-notes.md by adding a section about machine learning", 
-                 "Updating existing file content")
-        
+        run_scenarios(chatbot, _BASIC_OPS_SCENARIOS)
+
         # Demo 3: Advanced Operations
         print_section("DEMO 3: ADVANCED FILE OPERATIONS")
-        
-        demo_chat(chatbot, "Create a folder called 'ai-research'", 
-                 "Creating a new directory")
-        
-        demo_chat(chatbot, "Move demo-notes.md to the ai-research folder", 
-                 "Moving files between directories")
-        
-        demo_chat(chatbot, "Search for files containing 'AI' or 'machine learning'", 
-                 "Searching file contents")
-        
-        demo_chat(chatbot, "Get detailed information about the demo-notes.md file in ai-research", 
-                 "Analyzing file statistics")
-        
-        demo_chat(chatbot, "Create a backup of ai-research/demo-notes.md", 
-                 "Creating backup copies")
+        run_scenarios(chatbot, _ADVANCED_OPS_SCENARIOS)
         
         # Demo 4: Model Switching
         print_section("DEMO 4: MODEL SWITCHING DEMONSTRATION")
@@ -139,27 +169,16 @@ def main():
         
         # Demo 5: Security Testing
         print_section("DEMO 5: SECURITY CONSTRAINT TESTING")
-        
-        demo_chat(chatbot, "List files in the parent directory", 
-                 "Testing security: trying to access parent directory")
-        
-        demo_chat(chatbot, "Read the file ../../../etc/passwd", 
-                 "Testing security: trying to access system files")
-        
-        demo_chat(chatbot, "Create a file at /tmp/hack.txt", 
-                 "Testing security: trying to write outside sandbox")
-        
+
+        # The security probes are standalone, so start from a fresh history:
+        # shorter requests and a stable system-prompt prefix that provider-side
+        # prompt caching can reuse
+        chatbot.reset_conversation()
+        run_scenarios(chatbot, _SECURITY_SCENARIOS)
+
         # Demo 6: Natural Language Understanding
         print_section("DEMO 6: NATURAL LANGUAGE UNDERSTANDING")
-        
-        demo_chat(chatbot, "Show me what I've been working on lately", 
-                 "Natural language request for recent files")
-        
-        demo_chat(chatbot, "I need to organize my files better - what do you suggest?", 
-                 "Asking for organizational advice")
-        
-        demo_chat(chatbot, "Clean up by removing the demo file we created", 
-                 "Natural language deletion request")
+        run_scenarios(chatbot, _NATURAL_LANGUAGE_SCENARIOS)
         
         # Final Summary
         print_section("DEMO SUMMARY")
@@ -204,13 +223,7 @@ def main():
                         break
                     elif user_input.lower() == 'models':
                         print("\n🧠 AVAILABLE MODELS:")
-                        for model_id, info in chatbot.get_available_models().items():
-                            current = "← CURRENT" if model_id == chatbot.model else ""
-                            recommended = "✅ RECOMMENDED" if info['recommended'] else ""
-                            print(f"  • {model_id}: {info['name']}")
-                            print(f"    💰 ${info['input_cost']:.2f}/${info['output_cost']:.2f} per million tokens")
-                            print(f"    📝 {info['description']} {recommended} {current}")
-                            print()
+                        print_models_block()
                         continue
                     elif user_input.lower().startswith('switch to '):
                         model_name = user_input[10:].strip()
@@ -229,10 +242,11 @@ def main():
                     elif not user_input:
                         continue
                     
-                    print("🤖 Assistant: ", end="")
-                    response = chatbot.chat(user_input)
-                    print(response)
-                    print()
+                    print("🤖 Assistant: ", end="", flush=True)
+                    for token in chatbot.stream_chat(user_input):
+                        sys.stdout.write(token)
+                        sys.stdout.flush()
+                    print("\n")
                     
                 except KeyboardInterrupt:
                     print("\n👋 Thanks for trying the demo!")
@@ -0,0 +1,88 @@
+"""
+Shared helpers for the Markdown Chatbot demo entry points.
+
+Keeps the scripted scenario tables and display formatting in one module so
+chatbot.py's CLI and chatbot_demo.py don't each compile and retain their own
+copy of the same literals and loops.
+"""
+
+import sys
+from typing import Dict
+
+# Separator built once at import; headers are emitted with a single write
+# instead of three print calls
+_BAR60 = "=" * 60
+
+# Scripted demo scenarios, built once at module load as immutable tuples so
+# every demo run (and any harness importing this module) shares the same
+# objects. Each entry is (message, description).
+_BASIC_OPS_SCENARIOS = (
+    ("List all my files",
+     "Starting with a simple directory listing"),
+    ("Create a file called demo-notes.md with some sample content about AI",
+     "Creating a new file with content"),
+    ("Read the demo-notes.md file",
+     "Reading the file we just created"),
+    ("Update demo-notes.md by adding a section about machine learning",
+     "Updating existing file content"),
+)
+
+_ADVANCED_OPS_SCENARIOS = (
+    ("Create a folder called 'ai-research'",
+     "Creating a new directory"),
+    ("Move demo-notes.md to the ai-research folder",
+     "Moving files between directories"),
+    ("Search for files containing 'AI' or 'machine learning'",
+     "Searching file contents"),
+    ("Get detailed information about the demo-notes.md file in ai-research",
+     "Analyzing file statistics"),
+    ("Create a backup of ai-research/demo-notes.md",
+     "Creating backup copies"),
+)
+
+_SECURITY_SCENARIOS = (
+    ("List files in the parent directory",
+     "Testing security: trying to access parent directory"),
+    ("Read the file ../../../etc/passwd",
+     "Testing security: trying to access system files"),
+    ("Create a file at /tmp/hack.txt",
+     "Testing security: trying to write outside sandbox"),
+)
+
+_NATURAL_LANGUAGE_SCENARIOS = (
+    ("Show me what I've been working on lately",
+     "Natural language request for recent files"),
+    ("I need to organize my files better - what do you suggest?",
+     "Asking for organizational advice"),
+    ("Clean up by removing the demo file we created",
+     "Natural language deletion request"),
+)
+
+def print_section(title: str):
+    """Print a formatted section header."""
+    sys.stdout.write(f"\n{_BAR60}\n🎯 {title}\n{_BAR60}\n")
+
+def build_model_blocks(models: Dict) -> Dict[str, str]:
+    """
+    Precompute the per-model display blocks (without the CURRENT marker).
+
+    Built once per model table; render_models_block overlays the marker for
+    whichever model is active instead of reformatting every display.
+    """
+    return {
+        model_id: (
+            f"  • {model_id}: {info['name']}\n"
+            f"    💰 ${info['input_cost']:.2f}/${info['output_cost']:.2f} per million tokens\n"
+            f"    📏 {info['context_window']} context\n"
+            f"    📝 {info['description']} "
+            + ("✅ RECOMMENDED " if info['recommended'] else "")
+        )
+        for model_id, info in models.items()
+    }
+
+def render_models_block(model_blocks: Dict[str, str], current_model: str) -> str:
+    """Render precomputed model blocks, marking the currently selected model."""
+    return "".join(
+        f"{block}{'← CURRENT' if model_id == current_model else ''}\n\n"
+        for model_id, block in model_blocks.items()
+    )
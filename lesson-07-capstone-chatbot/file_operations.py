@@ -5,48 +5,244 @@ This module provides file operation functions that are restricted to the documen
 All functions include security validation to prevent access outside the sandbox.
 """
 
+import errno
+import io
+import json
+import mmap
 import os
+import re
 import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from stat import S_IMODE, S_ISDIR, S_ISREG
+from typing import Dict, List, Optional
 
 # Security: Define the sandbox root
 DOCUMENTS_ROOT = Path(__file__).parent / "documents"
 
+# Sandbox root with symlinks and relative components resolved, computed once;
+# containment checks, relativization, and directory walks all work from these
+# constants instead of re-resolving or re-stringifying the root per call
+_ROOT = DOCUMENTS_ROOT.resolve()
+_ROOT_STR = str(_ROOT)
+
+# Length of the root prefix (plus separator); slicing entry paths at this
+# offset yields the sandbox-relative path without the component-by-component
+# comparison that os.path.relpath or Path.relative_to would repeat per entry
+_ROOT_PREFIX_LEN = len(_ROOT_STR) + 1
+
 class SecurityError(Exception):
     """Raised when attempting to access files outside the documents folder"""
     pass
 
+@lru_cache(maxsize=4096)
+def _resolve_within_root(file_path: str) -> Path:
+    """
+    Resolve a candidate path and check the sandbox boundary.
+
+    Memoized because a chat session validates the same few paths over and
+    over, and resolve() pays stat syscalls per path component each time.
+    Only successful resolutions are cached (lru_cache does not cache raised
+    exceptions); mutating operations clear the cache so renames and deletes
+    cannot leave stale resolutions behind.
+    """
+    # Convert to absolute path and resolve any .. or . components
+    full_path = (DOCUMENTS_ROOT / file_path).resolve()
+
+    # Ensure the resolved path is still within documents folder.
+    # is_relative_to compares path components, so a sibling like
+    # "documents2" can never pass the way a string-prefix check would allow.
+    if not full_path.is_relative_to(_ROOT):
+        raise SecurityError(f"Access denied: Path '{file_path}' is outside documents folder")
+
+    return full_path
+
 def validate_path(file_path: str) -> Path:
     """
     Validate that a file path is within the documents folder.
-    
+
     Args:
         file_path: Relative path from documents root
-        
+
     Returns:
         Absolute Path object if valid
-        
+
     Raises:
         SecurityError: If path attempts to escape documents folder
     """
     try:
-        # Convert to absolute path and resolve any .. or . components
-        full_path = (DOCUMENTS_ROOT / file_path).resolve()
-        
-        # Ensure the resolved path is still within documents folder
-        if not str(full_path).startswith(str(DOCUMENTS_ROOT.resolve())):
-            raise SecurityError(f"Access denied: Path '{file_path}' is outside documents folder")
-            
-        return full_path
-    except Exception as e:
+        return _resolve_within_root(file_path)
+    except SecurityError:
+        raise
+    except (OSError, ValueError) as e:
         raise SecurityError(f"Invalid path '{file_path}': {str(e)}")
 
+# Fast-reject pattern for obviously unsafe paths: absolute POSIX paths,
+# Windows drive letters, and any ".." component. Compiled once so bulk
+# validation pays a single regex scan per path instead of a resolve() plus
+# exception per rejection.
+_UNSAFE_PATH_RE = re.compile(r'(^[/\\]|^[A-Za-z]:[\\/]|(^|[\\/])\.\.([\\/]|$))')
+
+def validate_paths(file_paths: List[str]) -> Dict:
+    """
+    Validate a batch of file paths in one pass.
+
+    Obviously unsafe paths are rejected by the precompiled denylist regex
+    without paying the per-path resolve() and exception-raise cost; only the
+    survivors run the full validate_path check.
+
+    Args:
+        file_paths: Relative paths from documents root
+
+    Returns:
+        Dict mapping each input path to {"safe": bool, "detail": str}
+    """
+    results = {}
+    for file_path in file_paths:
+        if _UNSAFE_PATH_RE.search(file_path):
+            results[file_path] = {
+                "safe": False,
+                "detail": f"Access denied: Path '{file_path}' matches unsafe pattern"
+            }
+            continue
+        try:
+            results[file_path] = {"safe": True, "detail": str(validate_path(file_path))}
+        except SecurityError as e:
+            results[file_path] = {"safe": False, "detail": str(e)}
+    return results
+
 def ensure_markdown_extension(filename: str) -> str:
     """Ensure filename has .md extension"""
-    if not filename.endswith('.md'):
-        filename += '.md'
-    return filename
+    # Called on nearly every operation; a single endswith check allocates
+    # nothing when the extension is already present
+    return filename if filename.endswith('.md') else filename + '.md'
+
+def _count_lines(s: str) -> int:
+    """Count lines the way splitlines() would, without building the list."""
+    return s.count('\n') + (0 if not s or s.endswith('\n') else 1)
+
+# Directory listings are the most repeated read: a chat turn often lists the
+# same folder several times while the model decides what to do. Cache the
+# built result per directory for a short TTL; mutating operations clear the
+# cache immediately, so the TTL only bounds staleness from edits made outside
+# this process (no filesystem-watcher dependency needed at this scale).
+_DIR_CACHE: Dict[str, tuple] = {}
+_DIR_CACHE_TTL = 1.0
+
+# Incremented on every mutation; traversal caches fold this into their key so
+# a write instantly orphans any snapshot taken before it
+_mutation_gen = 0
+
+def _invalidate_caches():
+    """Drop cached path resolutions and directory listings after a mutation."""
+    global _mutation_gen
+    _mutation_gen += 1
+    _resolve_within_root.cache_clear()
+    _DIR_CACHE.clear()
+
+# Parent directories confirmed to exist in this process. mkdir(parents=True)
+# stats every path component on each call; once a parent has been created it
+# stays present (nothing here removes directories except moves, which clear
+# this set), so a set lookup replaces the syscalls on repeat writes.
+_known_dirs = set()
+
+def _ensure_parent(file_path: Path):
+    """Create file_path's parent directory unless it is known to exist."""
+    parent = str(file_path.parent)
+    if parent not in _known_dirs:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        _known_dirs.add(parent)
+
+# Files at or above this size get kernel access-pattern hints; small files
+# are served from cache anyway and the extra syscall would be pure overhead
+_LARGE_FILE_BYTES = 1 << 20
+
+# Per-thread scratch buffer reused across reads so repeated read_file /
+# get_file_info calls don't allocate a fresh buffer the size of every file;
+# thread-local storage keeps the parallel search workers from sharing one
+_tls = threading.local()
+
+def _read_all(path) -> bytes:
+    """
+    Read an entire file into a pooled per-thread buffer and return the bytes.
+
+    Sized from a single fstat, grown only when a larger file comes along
+    (minimum 64 KiB), so steady-state reads reuse the same allocation and the
+    only new object per call is the exact-length bytes result.
+    """
+    fd = os.open(str(path), os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0))
+    try:
+        size = os.fstat(fd).st_size
+        if size >= _LARGE_FILE_BYTES and hasattr(os, 'posix_fadvise'):
+            # Tell the kernel this is one sequential pass so it extends
+            # readahead instead of guessing
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+        buf = getattr(_tls, 'buf', None)
+        if buf is None or len(buf) < size:
+            _tls.buf = buf = bytearray(max(size, 65536))
+        view = memoryview(buf)
+        # FileIO.readinto fills the pooled buffer directly on every platform
+        # (os.readv is Unix-only); closefd=False leaves the fd to the finally
+        fio = io.FileIO(fd, closefd=False)
+        read = 0
+        while read < size:
+            n = fio.readinto(view[read:size])
+            if not n:
+                break
+            read += n
+        return bytes(view[:read])
+    finally:
+        os.close(fd)
+
+# Whether O_TMPFILE + link publishing works here; cleared on first failure
+_o_tmpfile_works = hasattr(os, 'O_TMPFILE')
+
+def _atomic_write(path, data: bytes, durable: bool = False):
+    """
+    Write data to path so that readers never observe a partial file.
+
+    On Linux a new file is assembled under O_TMPFILE (anonymous, invisible
+    until linked) and published with a single link. An existing target takes
+    the sibling-temp-file + os.replace route directly — link cannot replace
+    a path, and discovering that after writing would pay for the payload
+    twice — as does any platform without O_TMPFILE or any filesystem where
+    the publish link fails (e.g. overlayfs reports EXDEV); that failure is
+    remembered so only the first write ever pays double. durable adds one
+    fsync before the file becomes visible.
+    """
+    global _o_tmpfile_works
+    path = str(path)
+    if _o_tmpfile_works and not os.path.exists(path):
+        try:
+            fd = os.open(os.path.dirname(path), os.O_TMPFILE | os.O_WRONLY, 0o644)
+        except OSError:
+            fd = -1
+        if fd >= 0:
+            try:
+                os.write(fd, data)
+                if durable:
+                    os.fsync(fd)
+                os.link(f'/proc/self/fd/{fd}', path)
+                return
+            except OSError:
+                # The filesystem cannot publish an anonymous file this way;
+                # don't retry the doomed branch on future writes
+                _o_tmpfile_works = False
+            finally:
+                os.close(fd)
+    tmp = f'{path}.tmp{os.getpid()}'
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+        if durable:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
 
 # ============================================================================
 # ESSENTIAL FUNCTIONS (5)
@@ -64,38 +260,39 @@ def list_directory(path: str = ".") -> Dict:
     """
     try:
         target_path = validate_path(path)
-        
-        if not target_path.exists():
-            return {
-                "error": f"Directory '{path}' does not exist",
-                "status": "error"
-            }
-            
-        if not target_path.is_dir():
-            return {
-                "error": f"'{path}' is not a directory",
-                "status": "error"
-            }
-        
+
+        cache_key = str(target_path)
+        cached = _DIR_CACHE.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
         files = []
         folders = []
+
+        # os.scandir serves file type and stat info from the directory read
+        # itself, avoiding the extra stat syscall and Path allocation that
+        # iterdir() pays per entry. A single stat(follow_symlinks=False) per
+        # entry is the sole source of truth: S_ISREG/S_ISDIR classify from
+        # its mode bits, its st_size feeds the listing, and symlinked entries
+        # cannot pull out-of-sandbox content into a listing.
+        with os.scandir(target_path) as entries:
+            for entry in entries:
+                st = entry.stat(follow_symlinks=False)
+                relative_path = entry.path[_ROOT_PREFIX_LEN:]
+                if S_ISREG(st.st_mode):
+                    files.append({
+                        "name": entry.name,
+                        "path": relative_path,
+                        "size": st.st_size,
+                        "is_markdown": entry.name.endswith('.md')
+                    })
+                elif S_ISDIR(st.st_mode):
+                    folders.append({
+                        "name": entry.name,
+                        "path": relative_path
+                    })
         
-        for item in target_path.iterdir():
-            relative_path = item.relative_to(DOCUMENTS_ROOT)
-            if item.is_file():
-                files.append({
-                    "name": item.name,
-                    "path": str(relative_path),
-                    "size": item.stat().st_size,
-                    "is_markdown": item.suffix == '.md'
-                })
-            elif item.is_dir():
-                folders.append({
-                    "name": item.name,
-                    "path": str(relative_path)
-                })
-        
-        return {
+        result = {
             "current_path": path,
             "files": files,
             "folders": folders,
@@ -103,10 +300,19 @@ def list_directory(path: str = ".") -> Dict:
             "total_folders": len(folders),
             "status": "success"
         }
-        
+        _DIR_CACHE[cache_key] = (time.monotonic() + _DIR_CACHE_TTL, result)
+        return result
+
+    # The exists()/is_dir() pre-checks used to cost two stat syscalls on
+    # every call just to pre-empt these two errors; scandir raises them
+    # itself, so the success path now pays nothing for them
     except SecurityError as e:
         return {"error": str(e), "status": "security_error"}
-    except Exception as e:
+    except FileNotFoundError:
+        return {"error": f"Directory '{path}' does not exist", "status": "error"}
+    except NotADirectoryError:
+        return {"error": f"'{path}' is not a directory", "status": "error"}
+    except OSError as e:
         return {"error": f"Failed to list directory: {str(e)}", "status": "error"}
 
 def read_file(filename: str) -> Dict:
@@ -122,33 +328,27 @@ def read_file(filename: str) -> Dict:
     try:
         filename = ensure_markdown_extension(filename)
         file_path = validate_path(filename)
-        
-        if not file_path.exists():
-            return {
-                "error": f"File '{filename}' does not exist",
-                "status": "error"
-            }
-            
-        if not file_path.is_file():
-            return {
-                "error": f"'{filename}' is not a file",
-                "status": "error"
-            }
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
+
+        # No exists()/is_file() pre-flight stats: the open inside _read_all
+        # reports both conditions itself and the error path maps them back
+        # to the same messages
+        content = _read_all(file_path).decode('utf-8')
+
         return {
             "filename": filename,
             "content": content,
             "size": len(content),
-            "lines": len(content.splitlines()),
+            "lines": _count_lines(content),
             "status": "success"
         }
-        
+
     except SecurityError as e:
         return {"error": str(e), "status": "security_error"}
-    except Exception as e:
+    except FileNotFoundError:
+        return {"error": f"File '{filename}' does not exist", "status": "error"}
+    except IsADirectoryError:
+        return {"error": f"'{filename}' is not a file", "status": "error"}
+    except (OSError, UnicodeDecodeError) as e:
         return {"error": f"Failed to read file: {str(e)}", "status": "error"}
 
 def create_file(filename: str, content: str = "") -> Dict:
@@ -167,7 +367,7 @@ def create_file(filename: str, content: str = "") -> Dict:
         file_path = validate_path(filename)
         
         # Create parent directories if they don't exist
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_parent(file_path)
         
         if file_path.exists():
             return {
@@ -175,9 +375,11 @@ def create_file(filename: str, content: str = "") -> Dict:
                 "status": "error"
             }
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
+        _atomic_write(file_path, content.encode('utf-8'))
+
+        # The namespace changed; drop caches that describe it
+        _invalidate_caches()
+
         return {
             "filename": filename,
             "content_length": len(content),
@@ -219,25 +421,34 @@ def update_file(filename: str, content: str, mode: str = "replace") -> Dict:
             }
         
         if mode == "replace":
-            new_content = content
-        else:
-            # Read existing content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                existing_content = f.read()
-            
-            if mode == "append":
-                new_content = existing_content + "\n" + content
-            elif mode == "prepend":
-                new_content = content + "\n" + existing_content
-        
-        # Write updated content
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        
+            _atomic_write(file_path, content.encode('utf-8'))
+            new_content_length = len(content)
+        elif mode == "append":
+            # Append only writes the new bytes; the old read-modify-write
+            # moved the entire file through memory to add a few lines
+            with open(file_path, 'ab') as f:
+                f.write(b'\n' + content.encode('utf-8'))
+            new_content_length = file_path.stat().st_size
+        else:  # prepend
+            # Prepending is inherently O(file size), but the existing bytes
+            # are streamed through a small buffer behind the new prefix
+            # instead of being decoded into one whole-file str; the swap is
+            # still atomic so a crash mid-write cannot truncate the file
+            tmp_path = f'{file_path}.tmp{os.getpid()}'
+            with open(tmp_path, 'wb') as out:
+                out.write(content.encode('utf-8') + b'\n')
+                with open(file_path, 'rb') as src:
+                    shutil.copyfileobj(src, out, 64 * 1024)
+            os.replace(tmp_path, file_path)
+            new_content_length = file_path.stat().st_size
+
+        # Sizes in cached listings and recent-files snapshots are now stale
+        _invalidate_caches()
+
         return {
             "filename": filename,
             "mode": mode,
-            "new_content_length": len(new_content),
+            "new_content_length": new_content_length,
             "message": f"Successfully updated '{filename}' using {mode} mode",
             "status": "success"
         }
@@ -278,7 +489,9 @@ def delete_file(filename: str) -> Dict:
         
         # Delete the file
         file_path.unlink()
-        
+
+        _invalidate_caches()
+
         return {
             "filename": filename,
             "deleted_size": file_size,
@@ -315,7 +528,9 @@ def create_directory(dirname: str) -> Dict:
             }
         
         dir_path.mkdir(parents=True, exist_ok=False)
-        
+
+        _invalidate_caches()
+
         return {
             "dirname": dirname,
             "message": f"Successfully created directory '{dirname}'",
@@ -355,7 +570,7 @@ def rename_file(old_name: str, new_name: str) -> Dict:
         new_path = old_path.parent / new_name
         
         # Validate the new path is still in documents folder
-        validate_path(str(new_path.relative_to(DOCUMENTS_ROOT)))
+        validate_path(str(new_path.relative_to(_ROOT)))
         
         if new_path.exists():
             return {
@@ -363,8 +578,18 @@ def rename_file(old_name: str, new_name: str) -> Dict:
                 "status": "error"
             }
         
-        old_path.rename(new_path)
-        
+        try:
+            old_path.rename(new_path)
+        except OSError as e:
+            # Same-device rename is the normal case; fall back to copy+unlink
+            # only if the sandbox ever spans filesystems
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(str(old_path), str(new_path))
+
+        _known_dirs.clear()
+        _invalidate_caches()
+
         return {
             "old_name": old_name,
             "new_name": new_name,
@@ -406,23 +631,35 @@ def move_file(source: str, destination: str) -> Dict:
             dest_path = validate_path(ensure_markdown_extension(destination))
         
         # Validate final destination path
-        validate_path(str(dest_path.relative_to(DOCUMENTS_ROOT)))
+        validate_path(str(dest_path.relative_to(_ROOT)))
         
         # Create parent directories if needed
-        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_parent(dest_path)
         
         if dest_path.exists():
             return {
-                "error": f"Destination '{dest_path.relative_to(DOCUMENTS_ROOT)}' already exists",
+                "error": f"Destination '{dest_path.relative_to(_ROOT)}' already exists",
                 "status": "error"
             }
         
-        shutil.move(str(source_path), str(dest_path))
-        
+        # Within the sandbox source and destination are almost always on the
+        # same filesystem, where a bare os.rename is a single syscall;
+        # shutil.move re-stats both sides before deciding to do the same
+        # thing. Fall back to the copying move only on a cross-device error.
+        try:
+            os.rename(source_path, dest_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(str(source_path), str(dest_path))
+
+        _known_dirs.clear()
+        _invalidate_caches()
+
         return {
             "source": source,
-            "destination": str(dest_path.relative_to(DOCUMENTS_ROOT)),
-            "message": f"Successfully moved '{source}' to '{dest_path.relative_to(DOCUMENTS_ROOT)}'",
+            "destination": str(dest_path.relative_to(_ROOT)),
+            "message": f"Successfully moved '{source}' to '{dest_path.relative_to(_ROOT)}'",
             "status": "success"
         }
         
@@ -435,6 +672,76 @@ def move_file(source: str, destination: str) -> Dict:
 # ADVANCED FUNCTIONS (5)
 # ============================================================================
 
+def _scan_file_content(path: str, relative_path: str, pattern) -> Optional[Dict]:
+    """
+    Scan one file for a compiled bytes pattern and return its search result.
+
+    Memory-maps the file so the kernel pages content in lazily and the regex
+    engine scans it without a userspace copy; only matching line windows are
+    sliced out and decoded. Returns None when the file has no matches or
+    cannot be read.
+
+    Args:
+        path: Absolute path of the file to scan
+        relative_path: Path relative to the documents root, used in the result
+        pattern: Compiled bytes regex to search for
+
+    Returns:
+        A search result dict, or None
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None  # Skip files that can't be read
+    try:
+        try:
+            mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None  # Empty or unmappable file
+        try:
+            if len(mapped) >= _LARGE_FILE_BYTES and hasattr(mapped, 'madvise'):
+                # One sequential scan: ask for aggressive readahead, and drop
+                # the pages afterwards so bulk searches of a large tree don't
+                # evict the small hot files from the page cache
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            matching_lines = []
+            line_no = 1
+            counted_to = 0
+            match = pattern.search(mapped)
+            while match and len(matching_lines) < 5:
+                pos = match.start()
+                line_start = mapped.rfind(b'\n', 0, pos) + 1
+                line_end = mapped.find(b'\n', pos)
+                if line_end < 0:
+                    line_end = len(mapped)
+                # Count newlines incrementally between hits with bounded
+                # find calls (memchr under the hood) instead of slicing the
+                # gap out of the map, which would copy it
+                nl = mapped.find(b'\n', counted_to, line_start)
+                while nl != -1:
+                    line_no += 1
+                    nl = mapped.find(b'\n', nl + 1, line_start)
+                counted_to = line_start
+                matching_lines.append({
+                    "line_number": line_no,
+                    "line_content": mapped[line_start:line_end].decode('utf-8', 'replace').strip()
+                })
+                # Continue on the next line; one entry per matching line
+                match = pattern.search(mapped, line_end + 1)
+            if not matching_lines:
+                return None
+            return {
+                "file": relative_path,
+                "match_type": "content",
+                "matches": matching_lines  # Limited to first 5 matches
+            }
+        finally:
+            if len(mapped) >= _LARGE_FILE_BYTES and hasattr(mapped, 'madvise'):
+                mapped.madvise(mmap.MADV_DONTNEED)
+            mapped.close()
+    finally:
+        os.close(fd)
+
 def search_files(query: str, search_type: str = "content") -> Dict:
     """
     Search for files containing specific text or matching filename patterns.
@@ -454,47 +761,48 @@ def search_files(query: str, search_type: str = "content") -> Dict:
             }
         
         results = []
-        total_searched = 0
-        
-        def search_directory(dir_path: Path):
-            nonlocal total_searched
-            for item in dir_path.rglob("*.md"):
-                if item.is_file():
-                    total_searched += 1
-                    relative_path = item.relative_to(DOCUMENTS_ROOT)
-                    
-                    if search_type == "filename":
-                        if query.lower() in item.name.lower():
-                            results.append({
-                                "file": str(relative_path),
-                                "match_type": "filename",
-                                "match_text": item.name
-                            })
-                    
-                    elif search_type == "content":
-                        try:
-                            with open(item, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                                if query.lower() in content.lower():
-                                    # Find the line containing the match
-                                    lines = content.splitlines()
-                                    matching_lines = []
-                                    for i, line in enumerate(lines, 1):
-                                        if query.lower() in line.lower():
-                                            matching_lines.append({
-                                                "line_number": i,
-                                                "line_content": line.strip()
-                                            })
-                                    
-                                    results.append({
-                                        "file": str(relative_path),
-                                        "match_type": "content",
-                                        "matches": matching_lines[:5]  # Limit to first 5 matches
-                                    })
-                        except Exception:
-                            continue  # Skip files that can't be read
-        
-        search_directory(DOCUMENTS_ROOT)
+        q_lower = query.lower()
+
+        # Phase 1: collect candidate .md files with a stack-based os.scandir
+        # walk (metadata only, no reads). DirEntry type checks are answered
+        # from the directory read itself, where rglob pays an extra stat
+        # syscall per matched path.
+        candidates = []
+        stack = [_ROOT_STR]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.md') and entry.is_file(follow_symlinks=False):
+                        candidates.append((entry.path, entry.path[_ROOT_PREFIX_LEN:], entry.name))
+
+        total_searched = len(candidates)
+
+        if search_type == "filename":
+            for _, relative_path, name in candidates:
+                if q_lower in name.lower():
+                    results.append({
+                        "file": relative_path,
+                        "match_type": "filename",
+                        "match_text": name
+                    })
+
+        elif search_type == "content":
+            # Compiled once per search; re's C engine scans the mapped bytes
+            # directly (case-insensitivity is ASCII-only on bytes patterns)
+            pattern = re.compile(re.escape(query).encode('utf-8'), re.IGNORECASE)
+
+            # Phase 2: scan candidates in parallel. The GIL is released
+            # during page-in and regex scanning, workers return
+            # self-contained dicts, and map() preserves candidate order.
+            max_workers = min(32, (os.cpu_count() or 1) * 4, max(1, len(candidates)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for scan_result in executor.map(
+                    lambda c: _scan_file_content(c[0], c[1], pattern), candidates
+                ):
+                    if scan_result is not None:
+                        results.append(scan_result)
         
         return {
             "query": query,
@@ -508,6 +816,52 @@ def search_files(query: str, search_type: str = "content") -> Dict:
     except Exception as e:
         return {"error": f"Search failed: {str(e)}", "status": "error"}
 
+# FICLONE ioctl number (Linux); asks the filesystem for a copy-on-write clone
+_FICLONE = 0x40049409
+
+def _fast_copy(src, dst):
+    """
+    Copy src to dst using the fastest mechanism the platform offers.
+
+    Tries, in order: a FICLONE ioctl (O(1) copy-on-write clone on btrfs/XFS),
+    os.copy_file_range (in-kernel copy, no userspace buffering), and finally
+    shutil.copyfile (which itself uses sendfile where available). The source
+    timestamps are preserved with a single os.utime, matching what
+    shutil.copy2 did here before.
+    """
+    src = str(src)
+    dst = str(dst)
+    st = os.stat(src)
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, st.st_mode)
+        try:
+            try:
+                import fcntl
+                fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+            except (ImportError, OSError):
+                if hasattr(os, 'copy_file_range'):
+                    remaining = st.st_size
+                    while remaining > 0:
+                        copied = os.copy_file_range(src_fd, dst_fd, remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                else:
+                    raise OSError
+        finally:
+            os.close(dst_fd)
+    except OSError:
+        # Fall back to the portable copy (sendfile-backed on CPython >= 3.8)
+        shutil.copyfile(src, dst)
+    finally:
+        os.close(src_fd)
+    # copy2 preserved permission bits as well as timestamps: the fast path
+    # creates dst with the mode masked by umask and the copyfile fallback
+    # uses a default mode, so restore the source bits explicitly
+    os.chmod(dst, S_IMODE(st.st_mode))
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
 def copy_file(source: str, destination: str) -> Dict:
     """
     Copy a file to a new location.
@@ -539,7 +893,7 @@ def copy_file(source: str, destination: str) -> Dict:
         dest_path = validate_path(destination)
         
         # Create parent directories if needed
-        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_parent(dest_path)
         
         if dest_path.exists():
             return {
@@ -548,8 +902,10 @@ def copy_file(source: str, destination: str) -> Dict:
             }
         
         # Copy the file
-        shutil.copy2(str(source_path), str(dest_path))
-        
+        _fast_copy(source_path, dest_path)
+
+        _invalidate_caches()
+
         return {
             "source": source,
             "destination": destination,
@@ -563,12 +919,54 @@ def copy_file(source: str, destination: str) -> Dict:
     except Exception as e:
         return {"error": f"Failed to copy file: {str(e)}", "status": "error"}
 
-def get_file_info(filename: str) -> Dict:
+# Markdown structure patterns for get_file_info, compiled once against bytes:
+# header lines (optionally indented '#') and inline links ('[text]('). Bytes
+# patterns keep the analysis pass decode-free.
+_HEADER_RE = re.compile(rb'(?m)^[ \t]*#')
+_LINK_RE = re.compile(rb'\[[^\]]*\]\(')
+
+@lru_cache(maxsize=128)
+def _analyze_content(path: str, mtime_ns: int, size: int) -> Dict:
+    """
+    Compute the content-derived fields of get_file_info.
+
+    Memoized on (path, mtime_ns, size): a chat session asks about the same
+    files repeatedly, and as long as a file's stat signature is unchanged the
+    earlier analysis is still valid, so the repeat call skips the read and
+    every counting pass. A modified file gets a new mtime and therefore a
+    fresh entry.
+    """
+    # Analyze the raw bytes instead of decoding to str and materializing
+    # splitlines()/split() lists: each C-level count/regex pass below
+    # streams over the buffer once with no throwaway line lists, and the
+    # content is never returned to the caller so decoding it is wasted
+    # work. Markdown syntax characters are all ASCII, so byte-level
+    # matching is exact.
+    data = _read_all(path)
+
+    line_count = data.count(b'\n')
+    if data and not data.endswith(b'\n'):
+        line_count += 1
+    # Character count equals byte count for pure-ASCII files; only
+    # multi-byte content pays for a decode
+    return {
+        "lines": line_count,
+        "words": len(data.split()),
+        "characters": len(data) if data.isascii() else len(data.decode('utf-8')),
+        "headers": sum(1 for _ in _HEADER_RE.finditer(data)),
+        "links": sum(1 for _ in _LINK_RE.finditer(data)),
+        "code_blocks": data.count(b'```') // 2,  # Pairs of ```
+        "is_empty": not data.strip(),
+    }
+
+def get_file_info(filename: str, analyze: bool = True) -> Dict:
     """
     Get detailed information about a file.
     
     Args:
         filename: Name or path of the file
+        analyze: Whether to read the content for structure analysis
+            (default: True); False returns stat-derived metadata only
         
     Returns:
         Dict with file information
@@ -591,32 +989,27 @@ def get_file_info(filename: str) -> Dict:
         
         # Get file stats
         stat = file_path.stat()
-        
-        # Read content for analysis
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        lines = content.splitlines()
-        words = len(content.split())
-        characters = len(content)
-        
-        # Analyze markdown structure
-        headers = [line for line in lines if line.strip().startswith('#')]
-        links = [line for line in lines if '[' in line and '](' in line]
-        code_blocks = content.count('```')
-        
+
+        if not analyze:
+            # Metadata-only fast path: everything below comes from the stat,
+            # so callers listing many files never pay a content read
+            return {
+                "filename": filename,
+                "size_bytes": stat.st_size,
+                "created": stat.st_ctime,
+                "modified": stat.st_mtime,
+                "is_empty": stat.st_size == 0,
+                "status": "success"
+            }
+
+        analysis = _analyze_content(str(file_path), stat.st_mtime_ns, stat.st_size)
+
         return {
             "filename": filename,
             "size_bytes": stat.st_size,
             "created": stat.st_ctime,
             "modified": stat.st_mtime,
-            "lines": len(lines),
-            "words": words,
-            "characters": characters,
-            "headers": len(headers),
-            "links": len(links),
-            "code_blocks": code_blocks // 2,  # Pairs of ```
-            "is_empty": len(content.strip()) == 0,
+            **analysis,
             "status": "success"
         }
         
@@ -658,14 +1051,16 @@ def create_backup(filename: str) -> Dict:
         backup_path = file_path.parent / backup_name
         
         # Validate backup path
-        validate_path(str(backup_path.relative_to(DOCUMENTS_ROOT)))
+        validate_path(str(backup_path.relative_to(_ROOT)))
         
         # Copy the file
-        shutil.copy2(str(file_path), str(backup_path))
-        
+        _fast_copy(file_path, backup_path)
+
+        _invalidate_caches()
+
         return {
             "original_file": filename,
-            "backup_file": str(backup_path.relative_to(DOCUMENTS_ROOT)),
+            "backup_file": str(backup_path.relative_to(_ROOT)),
             "backup_size": backup_path.stat().st_size,
             "timestamp": timestamp,
             "message": f"Successfully created backup of '{filename}'",
@@ -677,6 +1072,37 @@ def create_backup(filename: str) -> Dict:
     except Exception as e:
         return {"error": f"Failed to create backup: {str(e)}", "status": "error"}
 
+@lru_cache(maxsize=32)
+def _recent_snapshot(days: int, limit: int, _gen: int, _bucket: int) -> tuple:
+    """
+    Walk the tree and return the newest (mtime, rel_path, size) tuples.
+
+    The _gen and _bucket arguments exist only to scope the memoization; see
+    the call site in list_recent_files.
+    """
+    import heapq
+
+    cutoff_ts = time.time() - days * 86400
+    collected = []
+
+    # os.scandir walk: the stat cached on each DirEntry serves both the
+    # type check and the mtime/size, and candidates are compared as plain
+    # float timestamps — no datetime objects inside the loop
+    stack = [_ROOT_STR]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.md') and entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    if stat.st_mtime >= cutoff_ts:
+                        collected.append((stat.st_mtime, entry.path[_ROOT_PREFIX_LEN:], stat.st_size))
+
+    # Keep only the newest `limit` entries — O(N log limit) instead of a
+    # full sort
+    return tuple(heapq.nlargest(limit, collected))
+
 def list_recent_files(days: int = 7, limit: int = 10) -> Dict:
     """
     List recently modified files.
@@ -690,41 +1116,37 @@ def list_recent_files(days: int = 7, limit: int = 10) -> Dict:
     """
     try:
         import datetime
-        
+
         if days < 1 or days > 365:
             return {
                 "error": "Days must be between 1 and 365",
                 "status": "error"
             }
-            
+
         if limit < 1 or limit > 100:
             return {
                 "error": "Limit must be between 1 and 100",
                 "status": "error"
             }
-        
-        cutoff_time = datetime.datetime.now() - datetime.timedelta(days=days)
-        recent_files = []
-        
-        for file_path in DOCUMENTS_ROOT.rglob("*.md"):
-            if file_path.is_file():
-                stat = file_path.stat()
-                modified_time = datetime.datetime.fromtimestamp(stat.st_mtime)
-                
-                if modified_time >= cutoff_time:
-                    relative_path = file_path.relative_to(DOCUMENTS_ROOT)
-                    recent_files.append({
-                        "file": str(relative_path),
-                        "modified": modified_time.isoformat(),
-                        "size": stat.st_size,
-                        "days_ago": (datetime.datetime.now() - modified_time).days
-                    })
-        
-        # Sort by modification time (newest first)
-        recent_files.sort(key=lambda x: x["modified"], reverse=True)
-        
-        # Apply limit
-        recent_files = recent_files[:limit]
+
+        now_ts = datetime.datetime.now().timestamp()
+
+        # The full-tree walk is memoized on (days, limit, generation,
+        # 1-second time bucket): repeated calls within a turn reuse the
+        # snapshot, any in-process mutation bumps the generation, and the
+        # bucket bounds staleness from edits made outside the process
+        survivors = _recent_snapshot(days, limit, _mutation_gen, int(now_ts))
+
+        # Only the survivors are formatted
+        recent_files = [
+            {
+                "file": rel_path,
+                "modified": datetime.datetime.fromtimestamp(mtime).isoformat(),
+                "size": size,
+                "days_ago": int((now_ts - mtime) // 86400)
+            }
+            for mtime, rel_path, size in survivors
+        ]
         
         return {
             "days_back": days,
@@ -741,7 +1163,10 @@ def list_recent_files(days: int = 7, limit: int = 10) -> Dict:
 # ============================================================================
 
 # Function registry for the chatbot
-AVAILABLE_FUNCTIONS = {
+# Keys are interned so the per-tool-call dispatch lookup compares by pointer
+# identity instead of hashing and comparing the name byte by byte; the model
+# echoes these exact names back on every function call
+AVAILABLE_FUNCTIONS = {sys.intern(name): func for name, func in {
     "list_directory": list_directory,
     "read_file": read_file,
     "create_file": create_file,
@@ -755,10 +1180,12 @@ AVAILABLE_FUNCTIONS = {
     "get_file_info": get_file_info,
     "create_backup": create_backup,
     "list_recent_files": list_recent_files,
-}
+}.items()}
 
-# OpenAI function schemas
-FUNCTION_SCHEMAS = [
+# OpenAI function schemas, frozen as a tuple: the registry is shared by
+# reference with the SDK on every request, and an immutable container makes
+# accidental mutation (or a defensive copy by a client) a non-concern
+FUNCTION_SCHEMAS = (
     {
         "name": "list_directory",
         "description": "List files and folders in the documents directory",
@@ -941,6 +1368,10 @@ FUNCTION_SCHEMAS = [
                 "filename": {
                     "type": "string",
                     "description": "Name or path of the file to analyze"
+                },
+                "analyze": {
+                    "type": "boolean",
+                    "description": "Set to false to return only size and timestamps without reading the file (default: true)"
                 }
             },
             "required": ["filename"]
@@ -983,7 +1414,13 @@ FUNCTION_SCHEMAS = [
             }
         }
     }
-]
+)
+
+# The schemas never change after import, so serialize them exactly once.
+# The OpenAI SDK wants the Python objects above, but anything that needs the
+# JSON form — raw HTTP clients, request logging, cache keys — can reuse this
+# compact blob instead of re-encoding a few hundred nested dicts per call.
+FUNCTION_SCHEMAS_JSON = json.dumps(FUNCTION_SCHEMAS, separators=(',', ':')).encode('utf-8')
 
 # Utility functions
 def get_function_info() -> Dict:
@@ -996,30 +1433,26 @@ def get_function_info() -> Dict:
         "advanced_functions": ["search_files", "copy_file", "get_file_info", "create_backup", "list_recent_files"]
     }
 
+# Security test fixtures, built once at module load so every test run shares
+# the same immutable tuples
+_SAFE_TEST_PATHS = ("test.md", "folder/test.md", "./test.md")
+_UNSAFE_TEST_PATHS = ("../test.md", "../../etc/passwd", "/tmp/hack.md", "C:\\Windows\\System32")
+
 if __name__ == "__main__":
-    # Test the security validation
+    # Test the security validation in one batched pass
     print("🔒 Testing Security Validation")
     print("=" * 40)
-    
-    # These should work
-    safe_tests = ["test.md", "folder/test.md", "./test.md"]
-    for test in safe_tests:
-        try:
-            path = validate_path(test)
-            print(f"✅ SAFE: {test} -> {path}")
-        except SecurityError as e:
-            print(f"❌ BLOCKED: {test} -> {e}")
-    
-    print()
-    
-    # These should be blocked
-    unsafe_tests = ["../test.md", "../../etc/passwd", "/tmp/hack.md", "C:\\Windows\\System32"]
-    for test in unsafe_tests:
-        try:
-            path = validate_path(test)
-            print(f"⚠️  DANGER: {test} -> {path}")
-        except SecurityError as e:
-            print(f"✅ BLOCKED: {test} -> {e}")
+
+    results = validate_paths(list(_SAFE_TEST_PATHS + _UNSAFE_TEST_PATHS))
+    report = []
+    for test, outcome in results.items():
+        expected_safe = test in _SAFE_TEST_PATHS
+        if outcome["safe"]:
+            marker = "✅ SAFE" if expected_safe else "⚠️  DANGER"
+        else:
+            marker = "✅ BLOCKED" if not expected_safe else "❌ BLOCKED"
+        report.append(f"{marker}: {test} -> {outcome['detail']}")
+    print("\n".join(report))
     
     print(f"\n📊 Function Registry: {len(AVAILABLE_FUNCTIONS)} functions available")
     print(f"📋 Function Schemas: {len(FUNCTION_SCHEMAS)} schemas defined") 
\ No newline at end of file